@@ -15,18 +15,64 @@ The service provides:
 """
 
 import os
+import re
 import sys
 import json
+import time
+import queue
+import signal
+import socket
 import logging
 import argparse
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
 from urllib.parse import urlparse, parse_qs
+from serial.tools import list_ports
 
 # Add the parent directory to the path to import smartusbhub
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from smartusbhub import SmartUSBHub
 
+# Channel numbers accepted by the API
+VALID_CHANNELS = frozenset((1, 2, 3, 4))
+
+# Longest digit string parsed as a channel or state; int() refuses very long
+# strings, and anything longer is out of range anyway
+MAX_NUMBER_DIGITS = 4
+
+# Request paths served by SmartUSBHubRequestHandler
+DEVICE_INFO_PATH = re.compile(r'^/device/info$')
+CHANNEL_POWER_PATH = re.compile(r'^/channel/power/([^/]+)$')
+CHANNEL_DATALINE_PATH = re.compile(r'^/channel/dataline/([^/]+)$')
+
+# Largest POST body accepted; {"channels": [...], "state": n} is far smaller
+MAX_BODY_SIZE = 4096
+
+# Fixed identity fields of each hub seen on previous runs, keyed by serial
+# port and USB identity
+DEFAULT_INFO_CACHE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'smartusbhub', 'info.json')
+
+# Device info fields that never change for a given hub, and so may be persisted
+INFO_CACHE_FIELDS = ('hardware_version', 'firmware_version')
+
+# Shared compact JSON encoder for response bodies
+_JSON_ENCODE = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+try:
+    import orjson
+
+    def _dumps(data):
+        """Encode data as compact UTF-8 JSON bytes."""
+        # Channel status dicts are keyed by int, which orjson rejects by default
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps(data):
+        """Encode data as compact UTF-8 JSON bytes."""
+        return _JSON_ENCODE(data).encode()
+
 
 class SmartUSBHubService:
     """
@@ -34,7 +80,8 @@ class SmartUSBHubService:
     a RESTful API for controlling the device.
     """
 
-    def __init__(self, port=None, host='localhost', http_port=18089):
+    def __init__(self, port=None, host='localhost', http_port=18089, workers=4, status_ttl=0.05,
+                 info_cache=DEFAULT_INFO_CACHE):
         """
         Initialize the SmartUSBHub service.
         
@@ -42,13 +89,36 @@ class SmartUSBHubService:
             port (str): Serial port name. If None, will auto-discover.
             host (str): Host address for the HTTP server.
             http_port (int): Port for the HTTP server.
+            workers (int): Number of threads serving HTTP requests.
+            status_ttl (float): Seconds a channel status reading is served from
+                cache before the hub is queried again.
+            info_cache (str): File persisting the hub's hardware and firmware
+                versions across restarts. Empty or None disables it.
         """
         self.host = host
         self.http_port = http_port
+        self.workers = workers
+        self.status_ttl = status_ttl
+        self.info_cache = info_cache
         self.hub = None
         self.server = None
         self.server_thread = None
         
+        # The hub is a single serial device. All commands go through one queue
+        # served by a dedicated I/O thread, so they never interleave on the UART.
+        self._cmd_q = queue.Queue()
+        self._hub_thread = None
+        
+        # Recent hub query results: key -> (value, monotonic deadline or None).
+        # The generation is bumped on every invalidation so a query that
+        # raced with a write does not store its stale result.
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        
+        # Encoded /device/info response body, kept in step with the cached info
+        self._device_info_bytes = None
+        
         # Connect to the SmartUSBHub
         if port:
             self.hub = SmartUSBHub(port)
@@ -59,12 +129,154 @@ class SmartUSBHubService:
             raise RuntimeError("Failed to connect to SmartUSBHub")
             
         logging.info(f"Connected to SmartUSBHub on {self.hub.port}")
+        self._enable_low_latency()
+        
+        # Queries without side effects; repeats of these in one batch of
+        # queued commands are answered by a single hub call.
+        self._hub_reads = {
+            self._query_device_info,
+            self.hub.get_channel_power_status,
+            self.hub.get_channel_dataline_status,
+        }
+        self._hub_thread = threading.Thread(target=self._hub_loop, daemon=True)
+        self._hub_thread.start()
+        
+        # SmartUSBHub's constructor has already read the device info; build the
+        # first answer from what it found instead of querying the hub again.
+        # Versions it missed are filled in from a previous run.
+        self._info_cache_key = self._device_key()
+        self._saved_identity = self._load_identity()
+        self._store_device_info(*self._device_info_from_hub())
+        
+    def _enable_low_latency(self):
+        """
+        Put the serial port in low-latency mode so the USB-serial driver hands
+        each reply over immediately instead of after its latency timer expires.
+        Only supported on Linux; failures are logged and otherwise ignored.
+        """
+        set_low_latency_mode = getattr(self.hub.ser, 'set_low_latency_mode', None)
+        if set_low_latency_mode is None:
+            logging.debug("Serial low-latency mode is not supported on this platform")
+            return
+        try:
+            set_low_latency_mode(True)
+            logging.info(f"Enabled low-latency mode on {self.hub.port}")
+        except NotImplementedError:
+            # pyserial defines the method on every POSIX platform but only implements it on Linux
+            logging.debug("Serial low-latency mode is not supported on this platform")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not enable low-latency mode on {self.hub.port}: {e}")
+        
+    def _device_key(self):
+        """
+        Identify the connected hub for the device info cache.
+        
+        Returns:
+            str: Serial port, plus USB VID:PID and serial number when known.
+        """
+        for port_info in list_ports.comports():
+            if port_info.device == self.hub.port and port_info.vid is not None:
+                return (f"{self.hub.port}|{port_info.vid:04x}:{port_info.pid:04x}:"
+                        f"{port_info.serial_number or ''}")
+        return self.hub.port
+        
+    def _read_info_cache(self):
+        """
+        Read the whole device info cache file.
+        
+        Returns:
+            dict: Device key -> device info; empty if the file is missing or unreadable.
+        """
+        try:
+            with open(self.info_cache, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+        
+    def _load_identity(self):
+        """
+        Get the hardware and firmware versions saved for this hub by a previous run.
+        
+        Returns:
+            dict: Field name -> value for the fields found; empty if nothing is cached.
+        """
+        if not self.info_cache:
+            return {}
+        entry = self._read_info_cache().get(self._info_cache_key)
+        if not isinstance(entry, dict):
+            return {}
+        return {field: entry[field] for field in INFO_CACHE_FIELDS if entry.get(field) is not None}
+        
+    def _save_identity(self, identity):
+        """
+        Persist the hardware and firmware versions of this hub, keeping entries
+        for other hubs.
+        """
+        if not self.info_cache:
+            return
+        entries = self._read_info_cache()
+        entries[self._info_cache_key] = identity
+        tmp_path = self.info_cache + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.info_cache), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.info_cache)
+        except OSError as e:
+            logging.warning(f"Failed to save device info cache {self.info_cache}: {e}")
+            
+    def _device_info_from_hub(self):
+        """
+        Build device info from the values the hub last read, in the same format as
+        SmartUSBHub.get_device_info. Versions the hub has not read are taken
+        from the info cache file, but such a reply is not complete, so the hub
+        is asked again next time.
+        
+        Returns:
+            tuple: (info dict, True if every field was actually read).
+        """
+        hub = self.hub
+        # Check the raw values: get_device_info maps unanswered settings to
+        # "N/A" or "disabled", and the versions below may come from disk,
+        # either of which would hide a failed read
+        complete = all(value is not None for value in (
+            hub.device_address, hub.hardware_version, hub.firmware_version,
+            hub.operate_mode, hub.auto_restore_status, hub.button_control_status))
+        
+        hardware_version = hub.hardware_version
+        if hardware_version is None:
+            hardware_version = self._saved_identity.get('hardware_version')
+        firmware_version = hub.firmware_version
+        if firmware_version is None:
+            firmware_version = self._saved_identity.get('firmware_version')
+        info = {
+            "id": hub.port.split("/")[-1],
+            "address": hub.device_address,
+            "hardware_version": hardware_version,
+            "firmware_version": firmware_version,
+            "operate_mode": "normal" if hub.operate_mode == 0 else "interlock" if hub.operate_mode == 1 else "N/A",
+            "auto_restore": "enabled" if hub.auto_restore_status == 1 else "disabled",
+            "button_control_status": "enabled" if hub.button_control_status == 1 else "disabled"
+        }
+        return info, complete
+        
+    def _query_device_info(self):
+        """
+        Read device info from the hub. Runs on the I/O thread.
+        
+        Returns:
+            tuple: (info dict, True if every field was actually read).
+        """
+        self.hub.get_device_info()
+        return self._device_info_from_hub()
         
     def start(self):
         """
         Start the HTTP server to provide RESTful API access.
         """
-        self.server = HTTPServer((self.host, self.http_port), SmartUSBHubRequestHandler)
+        self.server = PooledHTTPServer((self.host, self.http_port), SmartUSBHubRequestHandler,
+                                       max_workers=self.workers)
         self.server.hub_service = self  # Pass service reference to handler
         self.server_thread = threading.Thread(target=self.server.serve_forever)
         self.server_thread.daemon = True
@@ -79,17 +291,197 @@ class SmartUSBHubService:
             self.server.shutdown()
             self.server.server_close()
         if self.hub:
-            self.hub.disconnect()
+            self._hub_call(self.hub.disconnect)
+            self._cmd_q.put(None)
+            self._hub_thread.join(timeout=1)
         logging.info("SmartUSBHub service stopped")
         
+    def _cache_lookup(self, key):
+        """
+        Return a cached query result, or None if missing or expired.
+        """
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, deadline = entry
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return value
+        
+    def _cache_invalidate(self, kind, channels):
+        """
+        Drop cached status entries of the given kind that cover any of the channels.
+        """
+        channels = set(channels)
+        with self._cache_lock:
+            self._cache_generation += 1
+            for key in [k for k in self._cache if k[0] == kind and channels & set(k[1])]:
+                del self._cache[key]
+        
+    def _cached_query(self, key, ttl, query, *args):
+        """
+        Run a hub query, serving the result from cache while it is fresh.
+        
+        Args:
+            key (tuple): Cache key.
+            ttl (float or None): Lifetime of the result in seconds, None for no expiry.
+            query (callable): Function to call on a cache miss.
+            *args: Arguments for the query.
+            
+        Returns:
+            The query result, or None if the hub did not answer.
+        """
+        value = self._cache_lookup(key)
+        if value is not None:
+            return value
+        with self._cache_lock:
+            generation = self._cache_generation
+        value = query(*args)
+        if value is None:
+            return None
+        deadline = None if ttl is None else time.monotonic() + ttl
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._cache[key] = (value, deadline)
+        return value
+        
+    def _hub_loop(self):
+        """
+        Run queued hub commands in order on the I/O thread.
+        
+        Each iteration takes every command already waiting in the queue. A read
+        that repeats an earlier read of the same batch, with no write between
+        them, gets that earlier result instead of another serial transaction.
+        """
+        running = True
+        while running:
+            item = self._cmd_q.get()
+            if item is None:
+                break
+            batch = [item]
+            while True:
+                try:
+                    item = self._cmd_q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+                
+            reads = {}
+            for method, args, kwargs, future in batch:
+                key = (method, args)
+                if key in reads:
+                    result, error = reads[key]
+                else:
+                    result, error = None, None
+                    try:
+                        result = method(*args, **kwargs)
+                        if isinstance(result, dict):
+                            # The hub returns its internal status dict; hand out a snapshot
+                            result = dict(result)
+                    except Exception as e:
+                        error = e
+                    if method in self._hub_reads:
+                        reads[key] = (result, error)
+                    else:
+                        reads.clear()
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+                    
+    def _hub_call(self, method, *args, **kwargs):
+        """
+        Run a hub method on the I/O thread and wait for its result.
+        """
+        future = Future()
+        self._cmd_q.put((method, args, kwargs, future))
+        return future.result()
+        
+    def _read_channels(self, method, channels):
+        """
+        Query a status with one hub command per channel.
+        
+        A multi-channel query is answered with one frame per channel, but the hub
+        returns as soon as the first frame arrives, so the other channels could
+        still hold values from an earlier reply. Single-channel queries avoid that.
+        
+        Args:
+            method (callable): Hub method reading the status.
+            channels (list): List of channel numbers (1-4).
+            
+        Returns:
+            dict or None: Channel number -> status, or None if any channel did not answer.
+        """
+        result = {}
+        for channel in channels:
+            status = self._hub_call(method, channel)
+            if isinstance(status, dict):
+                status = status.get(channel)
+            if status is None:
+                return None
+            result[channel] = status
+        return result
+        
+    def _get_channel_status(self, kind, method, channels):
+        """
+        Get the status of some channels, served from cache while it is fresh.
+        
+        Args:
+            kind (str): Cache key for the status, 'power' or 'dataline'.
+            method (callable): Hub method reading that status.
+            channels (list): List of channel numbers (1-4).
+            
+        Returns:
+            dict or None: Channel number -> status, or None if the hub did not answer.
+        """
+        return self._cached_query((kind, tuple(channels)), self.status_ttl,
+                                  self._read_channels, method, channels)
+        
     def get_device_info(self):
         """
-        Get device information.
+        Get device information. A complete result is cached for the lifetime of
+        the service; fields the hub did not answer for are retried next time.
         
         Returns:
             dict: Device information.
         """
-        return self.hub.get_device_info()
+        info = self._cache_lookup(('device_info',))
+        if info is not None:
+            return info
+        info, complete = self._hub_call(self._query_device_info)
+        self._store_device_info(info, complete)
+        return info
+        
+    def _store_device_info(self, info, complete):
+        """
+        Cache a complete device info reading, saving its hardware and firmware
+        versions to disk when they changed.
+        """
+        if not complete:
+            return
+        with self._cache_lock:
+            self._cache[('device_info',)] = (info, None)
+            self._device_info_bytes = _dumps(info)
+        identity = {field: info[field] for field in INFO_CACHE_FIELDS}
+        if identity != self._saved_identity:
+            self._saved_identity = identity
+            self._save_identity(identity)
+        
+    def get_device_info_json(self):
+        """
+        Get device information as an encoded JSON document.
+        
+        Returns:
+            bytes: UTF-8 encoded device information.
+        """
+        data = self._device_info_bytes
+        if data is None:
+            data = _dumps(self.get_device_info())
+        return data
         
     def set_channel_power(self, channels, state):
         """
@@ -102,7 +494,9 @@ class SmartUSBHubService:
         Returns:
             bool: True if successful, False otherwise.
         """
-        return self.hub.set_channel_power(*channels, state=state)
+        success = self._hub_call(self.hub.set_channel_power, *channels, state=state)
+        self._cache_invalidate('power', channels)
+        return success
         
     def get_channel_power_status(self, channels):
         """
@@ -114,10 +508,10 @@ class SmartUSBHubService:
         Returns:
             dict or int or None: Power status for the channels.
         """
-        if len(channels) == 1:
-            return self.hub.get_channel_power_status(channels[0])
-        else:
-            return self.hub.get_channel_power_status(*channels)
+        status = self._get_channel_status('power', self.hub.get_channel_power_status, channels)
+        if status is not None and len(channels) == 1:
+            return status[channels[0]]
+        return status
             
     def set_channel_dataline(self, channels, state):
         """
@@ -130,7 +524,9 @@ class SmartUSBHubService:
         Returns:
             bool: True if successful, False otherwise.
         """
-        return self.hub.set_channel_dataline(*channels, state=state)
+        success = self._hub_call(self.hub.set_channel_dataline, *channels, state=state)
+        self._cache_invalidate('dataline', channels)
+        return success
         
     def get_channel_dataline_status(self, channels):
         """
@@ -142,7 +538,85 @@ class SmartUSBHubService:
         Returns:
             dict or None: Dataline status for the channels.
         """
-        return self.hub.get_channel_dataline_status(*channels)
+        return self._get_channel_status('dataline', self.hub.get_channel_dataline_status, channels)
+
+
+class PooledHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTP server that handles requests on a fixed-size thread pool instead of
+    spawning a new thread per request.
+    """
+
+    daemon_threads = True
+    # Rebind immediately on restart even if old connections are in TIME_WAIT
+    allow_reuse_address = True
+
+    def __init__(self, server_address, RequestHandlerClass, max_workers=4):
+        """
+        Initialize the pooled HTTP server.
+
+        Args:
+            server_address (tuple): (host, port) to bind to.
+            RequestHandlerClass (type): Request handler class.
+            max_workers (int): Number of worker threads in the pool.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='smartusbhub-http')
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        # Connections accepted but still waiting for a free worker
+        self._queued = 0
+        super().__init__(server_address, RequestHandlerClass)
+
+    def process_request(self, request, client_address):
+        """
+        Queue the request on the thread pool (FIFO order).
+        """
+        with self._connections_lock:
+            self._connections.add(request)
+            self._queued += 1
+        self.executor.submit(self._process_queued_request, request, client_address)
+
+    def _process_queued_request(self, request, client_address):
+        """
+        Handle a connection on a pool worker, no longer counting it as queued.
+        """
+        with self._connections_lock:
+            self._queued -= 1
+        self.process_request_thread(request, client_address)
+
+    def has_queued_requests(self):
+        """
+        Check whether connections are waiting for a free worker.
+
+        Returns:
+            bool: True if at least one accepted connection has not been picked up yet.
+        """
+        with self._connections_lock:
+            return self._queued > 0
+
+    def shutdown_request(self, request):
+        """
+        Close a client connection once its handler is done.
+        """
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def server_close(self):
+        """
+        Close the listening socket, end open keep-alive connections and stop
+        the worker pool.
+        """
+        super().server_close()
+        with self._connections_lock:
+            connections = list(self._connections)
+        for request in connections:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.executor.shutdown(wait=False)
 
 
 class SmartUSBHubRequestHandler(BaseHTTPRequestHandler):
@@ -150,18 +624,69 @@ class SmartUSBHubRequestHandler(BaseHTTPRequestHandler):
     HTTP request handler for the SmartUSBHub service.
     """
     
+    # HTTP/1.1 keeps connections open between requests, and each open
+    # connection holds a pool worker. Idle connections are closed after
+    # `idle_timeout` seconds without a new request, and a connection is closed
+    # after its response whenever other clients are waiting for a worker (see
+    # _write_json). `timeout` bounds each read once a request has started.
+    protocol_version = 'HTTP/1.1'
+    idle_timeout = 1
+    timeout = 10
+    
+    # Responses are small and written in one piece; send them immediately
+    # rather than letting Nagle's algorithm hold them back (sets TCP_NODELAY).
+    disable_nagle_algorithm = True
+    
+    # Buffer the response stream so the status line, headers and body are
+    # flushed to the socket in one send instead of one per write.
+    wbufsize = -1
+    
+    def handle_one_request(self):
+        """
+        Wait up to `idle_timeout` seconds for the next request, then handle it.
+        A client that sends nothing in time is closed quietly: that is the
+        normal end of a keep-alive session, not an error.
+        """
+        self.connection.settimeout(self.idle_timeout)
+        try:
+            self.rfile.peek(1)
+        except socket.timeout:
+            self.close_connection = True
+            return
+        self.connection.settimeout(self.timeout)
+        super().handle_one_request()
+        
+    def _write_json(self, data, status_code):
+        """
+        Write a complete JSON response (status line, headers and body) in one call.
+        
+        Args:
+            data (dict or bytes): Response data, or an already encoded JSON body.
+            status_code (int): HTTP status code.
+        """
+        body = data if isinstance(data, bytes) else _dumps(data)
+        if self.server.has_queued_requests():
+            # Give this worker back to the clients waiting for one
+            self.close_connection = True
+        head = (
+            f"{self.protocol_version} {status_code} {self.responses[status_code][0]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if self.close_connection else 'keep-alive'}\r\n"
+            f"\r\n"
+        ).encode('latin-1')
+        self.log_request(status_code)
+        self.wfile.write(head + body)
+        
     def _send_response(self, data, status_code=200):
         """
         Send JSON response to client.
         
         Args:
-            data (dict): Response data.
+            data (dict or bytes): Response data, or an already encoded JSON body.
             status_code (int): HTTP status code.
         """
-        self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self._write_json(data, status_code)
         
     def _send_error(self, message, status_code=400):
         """
@@ -171,136 +696,240 @@ class SmartUSBHubRequestHandler(BaseHTTPRequestHandler):
             message (str): Error message.
             status_code (int): HTTP status code.
         """
-        self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({'error': message}).encode())
+        self._write_json({'error': message}, status_code)
+        
+    def _parse_channel(self, raw):
+        """
+        Validate a channel number taken from the request path.
+        
+        Args:
+            raw (str): Channel path segment.
+            
+        Returns:
+            int or None: The channel number, or None if an error response was sent.
+        """
+        if len(raw) > MAX_NUMBER_DIGITS or not raw.isdecimal():
+            self._send_error("Invalid channel number")
+            return None
+        channel = int(raw)
+        if channel not in VALID_CHANNELS:
+            self._send_error("Channel must be between 1 and 4")
+            return None
+        return channel
+        
+    def _get_device_info(self, service):
+        """
+        Handle GET /device/info.
+        """
+        try:
+            self._send_response(service.get_device_info_json())
+        except Exception as e:
+            self._send_error(f"Failed to get device info: {str(e)}", 500)
+            
+    def _get_channel_power(self, service, raw_channel):
+        """
+        Handle GET /channel/power/{channel}.
+        """
+        channel = self._parse_channel(raw_channel)
+        if channel is None:
+            return
+        try:
+            max_retries = 3
+            retry_count = 0
+            status = None
+            
+            while status is None and retry_count < max_retries:
+                status = service.get_channel_power_status([channel])
+                retry_count += 1
+                
+                # Add a small delay between retries (optional)
+                if status is None and retry_count < max_retries:
+                    time.sleep(1)
+            
+            if status is not None:
+                self._send_response({'channel': channel, 'status': status})
+            else:
+                self._send_error(f"Failed to get power status after {max_retries} retries", 500)
+        except Exception as e:
+            self._send_error(f"Failed to get power status: {str(e)}", 500)
+            
+    def _get_channel_dataline(self, service, raw_channel):
+        """
+        Handle GET /channel/dataline/{channel}.
+        """
+        channel = self._parse_channel(raw_channel)
+        if channel is None:
+            return
+        try:
+            status = service.get_channel_dataline_status([channel])
+            self._send_response({'channel': channel, 'status': status})
+        except Exception as e:
+            self._send_error(f"Failed to get dataline status: {str(e)}", 500)
+            
+    def _read_body(self):
+        """
+        Read the request body announced by Content-Length.
+        
+        Returns:
+            bytes or None: The body (empty if there is none), or None if an
+            error response was sent.
+        """
+        length = self.headers.get('Content-Length')
+        if not length:
+            return b''
+        if not length.isdecimal():
+            self.close_connection = True
+            self._send_error("Invalid Content-Length")
+            return None
+        # Compare digit counts first: int() refuses very long digit strings
+        if len(length) > len(str(MAX_BODY_SIZE)) or int(length) > MAX_BODY_SIZE:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self._send_error("Request body too large", 413)
+            return None
+        return self.rfile.read(int(length))
+        
+    def _parse_post_params(self, body, query):
+        """
+        Get the raw channels and state of a POST request.
+        
+        A JSON body ({"channels": [1, 2], "state": 1}) or a form-encoded body is
+        used when present; otherwise the parameters are taken from the query string.
+        
+        Args:
+            body (bytes): Request body.
+            query (str): Request query string.
+            
+        Returns:
+            dict or None: {'channels': list of int, 'state': int}, or None if an
+            error response was sent.
+        """
+        content_type = self.headers.get_content_type()
+        if body and content_type == 'application/json':
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                self._send_error("Invalid JSON body")
+                return None
+            if not isinstance(payload, dict):
+                self._send_error("Invalid parameters")
+                return None
+            channels = payload.get('channels')
+            state = payload.get('state')
+            # type() rather than isinstance() so JSON true/false are not taken as 1/0
+            if (not isinstance(channels, list) or not all(type(c) is int for c in channels)
+                    or type(state) is not int):
+                self._send_error("Invalid parameters")
+                return None
+            return {'channels': channels, 'state': state}
+            
+        if body and content_type == 'application/x-www-form-urlencoded':
+            query = body.decode('utf-8', 'replace')
+        query_params = parse_qs(query) if query else {}
+        raw_channels = query_params.get('channels', [''])[0]
+        if not raw_channels:
+            self._send_error("Missing channels parameter")
+            return None
+        raw_state = query_params.get('state', [''])[0]
+        if not raw_state:
+            self._send_error("Missing state parameter")
+            return None
+            
+        # Check the digits up front so bad input is a branch, not an exception
+        raw_channels = raw_channels.split(',')
+        if not all(len(raw) <= MAX_NUMBER_DIGITS and raw.isdecimal()
+                   for raw in raw_channels + [raw_state]):
+            self._send_error("Invalid parameters")
+            return None
+        return {'channels': [int(c) for c in raw_channels], 'state': int(raw_state)}
+        
+    def _parse_channels_state(self, body, query):
+        """
+        Get and validate the channels and state of a POST request.
         
+        Args:
+            body (bytes): Request body.
+            query (str): Request query string.
+            
+        Returns:
+            tuple or None: (channels, state), or None if an error response was sent.
+        """
+        params = self._parse_post_params(body, query)
+        if params is None:
+            return None
+            
+        channels = params['channels']
+        if not channels or not VALID_CHANNELS.issuperset(channels):
+            self._send_error("Channels must be between 1 and 4")
+            return None
+            
+        state = params['state']
+        if state not in (0, 1):
+            self._send_error("State must be 0 or 1")
+            return None
+        return channels, state
+        
+    # GET routes: (path pattern, handler). Captured groups are passed to the handler.
+    GET_ROUTES = (
+        (DEVICE_INFO_PATH, _get_device_info),
+        (CHANNEL_POWER_PATH, _get_channel_power),
+        (CHANNEL_DATALINE_PATH, _get_channel_dataline),
+    )
+    
+    # POST routes: exact path -> (name used in error messages, service setter).
+    POST_ROUTES = {
+        '/channel/power': ('power', SmartUSBHubService.set_channel_power),
+        '/channel/dataline': ('dataline', SmartUSBHubService.set_channel_dataline),
+    }
+    
     def do_GET(self):
         """
         Handle GET requests.
         """
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+        path = urlparse(self.path).path
         
         # Get service reference
         service = self.server.hub_service
         
-        if path == '/device/info':
-            # Get device information
-            try:
-                info = service.get_device_info()
-                self._send_response(info)
-            except Exception as e:
-                self._send_error(f"Failed to get device info: {str(e)}", 500)
-                
-        elif path.startswith('/channel/power/'):
-            # Get power status for a channel
-            try:
-                channel = int(path.split('/')[-1])
-                if channel < 1 or channel > 4:
-                    self._send_error("Channel must be between 1 and 4")
-                    return
-                    
-                max_retries = 3
-                retry_count = 0
-                status = None
-                
-                while status is None and retry_count < max_retries:
-                    status = service.get_channel_power_status([channel])
-                    retry_count += 1
-                    
-                    # Add a small delay between retries (optional)
-                    if status is None and retry_count < max_retries:
-                        import time
-                        time.sleep(1)
-                
-                if status is not None:
-                    self._send_response({'channel': channel, 'status': status})
-                else:
-                    self._send_error(f"Failed to get power status after {max_retries} retries", 500)
-            except ValueError:
-                self._send_error("Invalid channel number")
-            except Exception as e:
-                self._send_error(f"Failed to get power status: {str(e)}", 500)
-                
-        elif path.startswith('/channel/dataline/'):
-            # Get dataline status for a channel
-            try:
-                channel = int(path.split('/')[-1])
-                if channel < 1 or channel > 4:
-                    self._send_error("Channel must be between 1 and 4")
-                    return
-                    
-                status = service.get_channel_dataline_status([channel])
-                self._send_response({'channel': channel, 'status': status})
-            except ValueError:
-                self._send_error("Invalid channel number")
-            except Exception as e:
-                self._send_error(f"Failed to get dataline status: {str(e)}", 500)
+        for pattern, handler in self.GET_ROUTES:
+            match = pattern.match(path)
+            if match:
+                handler(self, service, *match.groups())
+                return
                 
-        else:
-            self._send_error("Endpoint not found", 404)
+        self._send_error("Endpoint not found", 404)
             
     def do_POST(self):
         """
         Handle POST requests.
         """
         parsed_path = urlparse(self.path)
-        path = parsed_path.path
         
         # Get service reference
         service = self.server.hub_service
         
-        # Parse query parameters
-        query_params = parse_qs(parsed_path.query)
-        
-        if path == '/channel/power':
-            # Set power state for channels
-            try:
-                # Get channels from query parameters
-                channels = [int(c) for c in query_params.get('channels', [])[0].split(',')]
-                if not channels or any(c < 1 or c > 4 for c in channels):
-                    self._send_error("Channels must be between 1 and 4")
-                    return
-                    
-                # Get state from query parameters
-                state = int(query_params.get('state', [None])[0])
-                if state not in [0, 1]:
-                    self._send_error("State must be 0 or 1")
-                    return
-                    
-                success = service.set_channel_power(channels, state)
-                self._send_response({'success': success})
-            except (ValueError, TypeError):
-                self._send_error("Invalid parameters")
-            except Exception as e:
-                self._send_error(f"Failed to set power state: {str(e)}", 500)
-                
-        elif path == '/channel/dataline':
-            # Set dataline state for channels
-            try:
-                # Get channels from query parameters
-                channels = [int(c) for c in query_params.get('channels', [])[0].split(',')]
-                if not channels or any(c < 1 or c > 4 for c in channels):
-                    self._send_error("Channels must be between 1 and 4")
-                    return
-                    
-                # Get state from query parameters
-                state = int(query_params.get('state', [None])[0])
-                if state not in [0, 1]:
-                    self._send_error("State must be 0 or 1")
-                    return
-                    
-                success = service.set_channel_dataline(channels, state)
-                self._send_response({'success': success})
-            except (ValueError, TypeError):
-                self._send_error("Invalid parameters")
-            except Exception as e:
-                self._send_error(f"Failed to set dataline state: {str(e)}", 500)
-                
-        else:
+        # Always consume the body so the next request on a kept-alive
+        # connection starts at the right place
+        body = self._read_body()
+        if body is None:
+            return
+            
+        route = self.POST_ROUTES.get(parsed_path.path)
+        if route is None:
             self._send_error("Endpoint not found", 404)
+            return
+        name, setter = route
+        
+        parsed = self._parse_channels_state(body, parsed_path.query)
+        if parsed is None:
+            return
+        channels, state = parsed
+        
+        try:
+            success = setter(service, channels, state)
+            self._send_response({'success': success})
+        except Exception as e:
+            self._send_error(f"Failed to set {name} state: {str(e)}", 500)
 
 
 def main():
@@ -311,6 +940,11 @@ def main():
     parser.add_argument('--port', help='Serial port name (e.g., /dev/ttyUSB0)')
     parser.add_argument('--host', default='localhost', help='HTTP server host (default: localhost)')
     parser.add_argument('--http-port', type=int, default=18089, help='HTTP server port (default: 18089)')
+    parser.add_argument('--workers', type=int, default=4, help='Number of HTTP worker threads (default: 4)')
+    parser.add_argument('--status-ttl', type=float, default=0.05,
+                        help='Seconds to cache channel status readings (default: 0.05)')
+    parser.add_argument('--info-cache', default=DEFAULT_INFO_CACHE,
+                        help=f'Hardware/firmware version cache file, empty to disable (default: {DEFAULT_INFO_CACHE})')
     parser.add_argument('--log-level', default='INFO', help='Logging level (default: INFO)')
     
     args = parser.parse_args()
@@ -323,19 +957,26 @@ def main():
     
     try:
         # Create and start the service
-        service = SmartUSBHubService(port=args.port, host=args.host, http_port=args.http_port)
+        service = SmartUSBHubService(port=args.port, host=args.host, http_port=args.http_port,
+                                     workers=args.workers, status_ttl=args.status_ttl,
+                                     info_cache=args.info_cache)
         service.start()
         
+        # Stop cleanly on Ctrl+C or systemd stop. These replace the SIGINT
+        # handler installed by SmartUSBHub, which exits without stopping the server.
+        stop_event = threading.Event()
+        signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        
         # Keep the service running
         print(f"SmartUSBHub service running on http://{args.host}:{args.http_port}")
         print("Press Ctrl+C to stop the service")
         
-        try:
-            while True:
-                pass
-        except KeyboardInterrupt:
-            print("\nStopping service...")
-            service.stop()
+        # Wake up periodically so signals are also delivered on Windows
+        while not stop_event.wait(1):
+            pass
+        print("\nStopping service...")
+        service.stop()
             
     except Exception as e:
         logging.error(f"Failed to start service: {str(e)}")